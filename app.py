@@ -5,7 +5,6 @@ This can be deployed to a service like Netlify Functions, Vercel Functions, or A
 Requirements:
 - PyMuPDF
 - ebooklib
-- Pillow
 - python-multipart (for FastAPI implementation)
 """
 
@@ -13,6 +12,7 @@ from fastapi import FastAPI, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 import uvicorn
+import asyncio
 import os
 import tempfile
 import uuid
@@ -32,6 +32,13 @@ app.add_middleware(
 # Create a temporary directory to store files
 TEMP_DIR = tempfile.mkdtemp()
 
+# Uploads are written to disk in chunks of this size rather than read whole
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# PyMuPDF isn't thread-safe, so conversions run one at a time. Each one already
+# spreads its work across a process pool.
+conversion_lock = asyncio.Lock()
+
 @app.post("/convert")
 async def convert_pdf(
     file: UploadFile = File(...),
@@ -49,13 +56,15 @@ async def convert_pdf(
     try:
         # Save the uploaded PDF file
         with open(pdf_path, "wb") as pdf_file:
-            pdf_file.write(await file.read())
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                pdf_file.write(chunk)
         
         # Use the title from the form or default to filename
         book_title = title or os.path.splitext(file.filename)[0]
         
-        # Perform the conversion
-        success = convert_pdf_to_epub(pdf_path, epub_path, book_title, author)
+        # Perform the conversion off the event loop so other requests aren't blocked
+        async with conversion_lock:
+            success = await asyncio.to_thread(convert_pdf_to_epub, pdf_path, epub_path, book_title, author)
         
         if not success:
             return {"status": "error", "message": "Conversion failed"}
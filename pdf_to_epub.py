@@ -1,11 +1,14 @@
 import re
+import html
 import fitz  # PyMuPDF
 from ebooklib import epub
-import io
-from PIL import Image
 import os
 import logging
-from typing import List, Tuple, Optional, Dict, Any
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, Iterator, List, Tuple, Optional, Dict, Any
 
 # Set up logging
 logging.basicConfig(
@@ -15,6 +18,345 @@ logging.basicConfig(
 )
 logger = logging.getLogger('pdf2epub')
 
+# Text extraction is CPU-bound inside MuPDF and stops scaling past a few workers
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Workers are started fresh rather than forked, since the pool may be created from a
+# thread (e.g. the web app) and forking a multi-threaded process can deadlock
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Document opened by the current worker process, reused across the pages it handles
+_worker_document: Optional[fitz.Document] = None
+
+# Lone surrogates can't be encoded as UTF-8 when the EPUB is written. They are rare,
+# so text is only translated when the search finds one.
+_SURROGATE_RE = re.compile("[\ud800-\udfff]")
+_SURROGATE_TABLE = dict.fromkeys(range(0xD800, 0xE000))
+
+# Formatting tags added by _preserve_formatting
+_TAG_REGEX = r"<[^>]*>"
+_TAG_RE = re.compile(_TAG_REGEX)
+
+# Characters that end a line without it continuing onto the next one
+_BREAK_CHARS = frozenset('.:!?\n"\')]}')
+
+# Roman numerals used in chapter headings
+_ROMAN_RE = re.compile(r"^[IVXLCDM]+$", re.IGNORECASE)
+_ROMAN_MAP = {
+    'I': 1, 'V': 5, 'X': 10, 'L': 50,
+    'C': 100, 'D': 500, 'M': 1000
+}
+
+def _int_to_roman(number: int) -> str:
+    """Convert a positive integer to a Roman numeral.
+    
+    Args:
+        number: Integer to convert
+        
+    Returns:
+        str: Roman numeral
+    """
+    numerals = [
+        (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"),
+        (100, "C"), (90, "XC"), (50, "L"), (40, "XL"),
+        (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")
+    ]
+    parts = []
+    for value, numeral in numerals:
+        count, number = divmod(number, value)
+        parts.append(numeral * count)
+    return "".join(parts)
+
+
+_ROMAN_CACHE = {_int_to_roman(n): n for n in range(1, 301)}
+
+# Dict extraction flags: image blocks (with their binary data) aren't needed for text
+_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES & ~fitz.TEXT_INHIBIT_SPACES
+
+# Font names that indicate a page may carry bold or italic spans. Besides the full
+# style names, this covers abbreviated suffixes ("MinionPro-It", "Garamond-BdIt"),
+# heavy weights and the TeX Computer Modern / EC faces ("CMTI10", "SFBX1000").
+_FORMATTED_FONT_RE = re.compile(
+    r"bold|italic|oblique|heavy|black|demi|[-,](?:it|obl|bd|bdit)\b|"
+    r"\b(?:cm|sf)(?:bx|b|ti|bxti|sl|bxsl|mi|mib|ssbx|ssi|bi|si)\d",
+    re.IGNORECASE
+)
+
+# Font descriptor /Flags bits (PDF 1.7, table 123)
+_FONT_FLAG_ITALIC = 1 << 6
+_FONT_FLAG_FORCE_BOLD = 1 << 18
+
+
+def _build_textual_number_regex() -> str:
+    """Build the regex source for textual numbers up to ONE THOUSAND.
+    
+    Numbers are matched token by token ("FIVE HUNDRED AND TWENTY-TWO" is units,
+    HUNDRED, AND, tens, units) rather than listing every combined phrase, which
+    keeps the compiled pattern small.
+    
+    Returns:
+        str: Regex source
+    """
+    units = "ONE|TWO|THREE|FOUR|FIVE|SIX|SEVEN|EIGHT|NINE"
+    teens = (
+        "TEN|ELEVEN|TWELVE|THIRTEEN|FOURTEEN|"
+        "FIFTEEN|SIXTEEN|SEVENTEEN|EIGHTEEN|NINETEEN"
+    )
+    tens = "TWENTY|THIRTY|FORTY|FIFTY|SIXTY|SEVENTY|EIGHTY|NINETY"
+    
+    # Longer words go first so e.g. SEVENTEEN isn't tried as SEVEN
+    below_hundred = rf"(?:(?:{tens})(?:[-\s](?:{units}))?|{teens}|{units})"
+    hundreds = rf"(?:{units})\s+HUNDRED(?:\s+AND\s+{below_hundred})?"
+    
+    return rf"(?:{hundreds}|{below_hundred}|ONE\s+THOUSAND)"
+
+
+def _build_chapter_regex() -> str:
+    """Build the unanchored regex source for chapter headings.
+    
+    Bare numerals are captured in the "roman" and "number" groups, so the
+    chapter number can be read from the match.
+    
+    Returns:
+        str: Regex source
+    """
+    textual_numbers_regex = _build_textual_number_regex()
+    
+    return (
+        rf"(?:"
+        rf"Chapter\s+(?:\d{{1,3}}(?=\b)|[IVXLCDM]+|{textual_numbers_regex})|"
+        rf"CHAPTER\s+(?:\d{{1,3}}(?=\b)|[IVXLCDM]+|{textual_numbers_regex})|"
+        rf"CHAPTER\s+(?:\d{{1,3}}(?=\b)|[IVXLCDM]+|{textual_numbers_regex})(?:[:\-\s]+.+)?|"
+        rf"(?P<roman>[IVXLCDM]+)|(?P<number>\d{{1,3}})(?=\b)"
+        rf")"
+    )
+
+
+# Heading patterns are constant, so they are built once at import
+_CHAPTER_REGEX = _build_chapter_regex()
+_PROLOGUE_EPILOGUE_REGEX = r"(?:PROLOGUE|EPILOGUE|PREFACE|FOREWORD|INTRODUCTION|AFTERWORD|POSTSCRIPT)"
+
+# Chapter, prologue and epilogue headings in one pass. Formatting tags around the
+# heading are allowed, so lines can be matched without stripping tags first. The
+# "chapter" group is set when the line is a chapter heading.
+_HEADING_RE = re.compile(
+    rf"^(?:{_TAG_REGEX})*\s*"
+    rf"(?:(?P<chapter>{_CHAPTER_REGEX})|{_PROLOGUE_EPILOGUE_REGEX})"
+    rf"(?:{_TAG_REGEX})*\s*$",
+    re.IGNORECASE
+)
+
+
+def _open_worker_document(pdf_path: str) -> fitz.Document:
+    """Return the PDF opened by the current worker process.
+    
+    PyMuPDF objects can't be pickled, so each worker opens the PDF itself
+    and keeps it open for the remaining jobs it is given.
+    
+    Args:
+        pdf_path: Path to the input PDF file
+        
+    Returns:
+        fitz.Document: Open PDF document
+    """
+    global _worker_document
+    
+    if _worker_document is None or _worker_document.name != pdf_path:
+        if _worker_document is not None:
+            _worker_document.close()
+        _worker_document = fitz.open(pdf_path)
+    
+    return _worker_document
+
+
+def _format_page(pdf_path: str, page_num: int) -> str:
+    """Extract formatted text from a single page inside a worker process.
+    
+    Args:
+        pdf_path: Path to the input PDF file
+        page_num: Zero-based page number
+        
+    Returns:
+        str: Text with HTML formatting tags
+    """
+    page = _open_worker_document(pdf_path)[page_num]
+    page_text = _preserve_formatting(page)
+    if _SURROGATE_RE.search(page_text):
+        page_text = page_text.translate(_SURROGATE_TABLE)
+    return page_text
+
+
+def _extract_image(pdf_path: str, xref: int) -> Optional[Tuple[bytes, str]]:
+    """Extract and compress a single image inside a worker process.
+    
+    Args:
+        pdf_path: Path to the input PDF file
+        xref: Cross-reference number of the image
+        
+    Returns:
+        tuple: Compressed image bytes and their extension, or None on failure
+    """
+    try:
+        base_image = _open_worker_document(pdf_path).extract_image(xref)
+        return _compress_image(base_image["image"], base_image["ext"])
+    except Exception as e:
+        logger.warning(f"Error extracting image {xref}: {e}")
+        return None
+
+
+def _compress_image(image_bytes: bytes, image_ext: str, quality: int = 75) -> Tuple[bytes, str]:
+    """Compress an image to reduce file size.
+    
+    Images already stored as JPEG are passed through unchanged rather than
+    decoded and re-encoded. Other colour images without transparency are
+    encoded as JPEG by MuPDF.
+    
+    Args:
+        image_bytes: The original image bytes
+        image_ext: The original image extension
+        quality: Compression quality (1-100)
+        
+    Returns:
+        tuple: Compressed image bytes and their extension
+    """
+    if image_ext in ("jpeg", "jpg"):
+        return image_bytes, image_ext
+    
+    try:
+        pix = fitz.Pixmap(image_bytes)
+        
+        # Use JPEG for RGB or CMYK images for better compression
+        if pix.n - pix.alpha >= 3 and pix.alpha == 0:
+            return pix.tobytes("jpeg", jpg_quality=quality), "jpeg"
+            
+        return image_bytes, image_ext
+    except Exception as e:
+        logger.warning(f"Image compression failed: {e}")
+        return image_bytes, image_ext  # Return original if compression fails
+
+
+def _lookahead(lines: Iterable[str], size: int) -> Iterator[Tuple[str, List[str]]]:
+    """Iterate over lines together with the lines that follow them.
+    
+    Args:
+        lines: Lines to iterate over
+        size: Number of following lines to include
+        
+    Yields:
+        tuple: Each line and up to `size` following lines
+    """
+    window = deque()
+    for line in lines:
+        window.append(line)
+        if len(window) > size:
+            yield window.popleft(), list(window)
+    while window:
+        yield window.popleft(), list(window)
+
+
+def _is_formatted_font(document: fitz.Document, xref: int, basefont: str) -> bool:
+    """Check whether a font is a bold or italic face.
+    
+    The name is checked first. Fonts whose names don't say fall back to their
+    font descriptor, which is also where MuPDF's span flags mostly come from.
+    
+    Args:
+        document: The PDF document
+        xref: Cross-reference number of the font
+        basefont: The font's base name
+        
+    Returns:
+        bool: True if the font looks bold, italic or oblique
+    """
+    if _FORMATTED_FONT_RE.search(basefont):
+        return True
+    
+    try:
+        kind, value = document.xref_get_key(xref, "FontDescriptor")
+        if kind != "xref":
+            return False
+        descriptor = int(value.split()[0])
+        
+        _, flags = document.xref_get_key(descriptor, "Flags")
+        _, italic_angle = document.xref_get_key(descriptor, "ItalicAngle")
+        _, weight = document.xref_get_key(descriptor, "FontWeight")
+        
+        flags = int(flags) if flags.lstrip("-").isdigit() else 0
+        if flags & (_FONT_FLAG_ITALIC | _FONT_FLAG_FORCE_BOLD):
+            return True
+        if italic_angle not in ("null", "0") and float(italic_angle) != 0:
+            return True
+        return weight != "null" and float(weight) >= 600
+    except Exception as e:
+        # Err on the side of the dict walk, which never loses formatting
+        logger.debug(f"Could not read font descriptor {xref}: {e}")
+        return True
+
+
+def _has_formatted_fonts(page: fitz.Page) -> bool:
+    """Check whether any font used on a page is a bold or italic face.
+    
+    Fonts are taken from the page's resources, which can list more fonts than
+    the page actually uses; that only sends more pages through the dict walk.
+    
+    Args:
+        page: The PDF page
+        
+    Returns:
+        bool: True if the page references a bold, italic or oblique font
+    """
+    # Entries are (xref, ext, type, basefont, name, encoding, ...)
+    return any(
+        _is_formatted_font(page.parent, font[0], font[3]) for font in page.get_fonts()
+    )
+
+
+def _preserve_formatting(page: fitz.Page) -> str:
+    """Preserve formatting (bold, italic) in extracted text.
+    
+    Span text is HTML-escaped before it is wrapped, so the only markup in the
+    result is the formatting tags added here.
+    
+    Args:
+        page: The PDF page
+        
+    Returns:
+        str: Text with HTML formatting tags
+    """
+    parts = []
+    try:
+        # Plain body text can't produce any tags, so skip the slower dict walk
+        if not _has_formatted_fonts(page):
+            return html.escape(page.get_text("text"), quote=False)
+        
+        for block in page.get_text("dict", flags=_DICT_FLAGS)["blocks"]:
+            if "lines" not in block:
+                continue
+                
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    span_text = html.escape(span["text"], quote=False)
+                    is_italic = span["flags"] & 2  # Check italic flag
+                    is_bold = "bold" in span["font"].lower() or span["flags"] & 16  # Check bold flag
+                    
+                    # Apply formatting
+                    if is_bold and is_italic:
+                        span_text = f"<b><i>{span_text}</i></b>"
+                    elif is_bold:
+                        span_text = f"<b>{span_text}</b>"
+                    elif is_italic:
+                        span_text = f"<i>{span_text}</i>"
+                        
+                    parts.append(span_text)
+                    
+                parts.append("\n")
+                
+        return "".join(parts)
+    except Exception as e:
+        logger.warning(f"Error preserving formatting: {e}")
+        return html.escape(page.get_text("text"), quote=False)  # Fallback to plain text
+
+
 class PDFToEPUBConverter:
     """A class to convert PDF files to EPUB format with chapter detection and formatting preservation."""
     
@@ -36,8 +378,7 @@ class PDFToEPUBConverter:
         self.book.add_author(self.author)
         
         # Patterns
-        self.chapter_pattern = self._build_chapter_pattern()
-        self.prologue_epilogue_pattern = self._build_prologue_epilogue_pattern()
+        self._heading_re = _HEADING_RE
     
     def convert(self) -> bool:
         """Main conversion method that orchestrates the PDF to EPUB transformation.
@@ -46,16 +387,20 @@ class PDFToEPUBConverter:
             bool: True if conversion was successful, False otherwise
         """
         try:
-            # Extract text and process PDF
-            pdf_text = self._extract_text_from_pdf()
+            # Each stage is a generator, so text flows through one chapter at a time
+            # instead of the whole book being held at every stage
+            page_texts = self._extract_text_from_pdf()
             
             # Process text
-            merged_text = self._merge_split_lines(pdf_text.splitlines())
+            merged_lines = self._merge_split_lines(
+                line for page_text in page_texts for line in page_text.splitlines()
+            )
             
             # Detect chapters
-            chapters, intro_text_lines = self._detect_chapters(merged_text)
+            chapters = self._detect_chapters(merged_lines)
             
-            # Create EPUB content
+            # Create EPUB content (the first item is always the introductory text)
+            intro_text_lines, _ = next(chapters)
             self._add_intro_to_epub(intro_text_lines)
             self._add_chapters_to_epub(chapters)
             
@@ -71,36 +416,44 @@ class PDFToEPUBConverter:
             logger.error(f"Error during conversion: {e}", exc_info=True)
             return False
     
-    def _extract_text_from_pdf(self) -> str:
+    def _extract_text_from_pdf(self) -> Iterator[str]:
         """Extract text and images from the PDF file.
         
-        Returns:
-            str: Extracted text from the PDF
-        """
-        pdf_text = ""
+        Page texts are yielded as they come out of the worker pool. Images from
+        pages without text are extracted in the pool as those pages are found,
+        and added to the EPUB once every page has been read.
         
+        Yields:
+            str: Extracted text of each page
+        """
         try:
             with fitz.open(self.pdf_path) as pdf_document:
                 # Extract cover image from first page if available
                 self._extract_cover_image(pdf_document)
+                page_count = pdf_document.page_count
                 
-                # Process each page
-                for page_num in range(pdf_document.page_count):
-                    page = pdf_document[page_num]
-                    
-                    # Extract text with formatting
-                    page_text = self._preserve_formatting(page)
+                # Extract text with formatting, spread across worker processes
+                with ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=_MP_CONTEXT) as executor:
+                    page_texts = executor.map(
+                        _format_page, repeat(self.pdf_path), range(page_count), chunksize=8
+                    )
                     
                     # If page has no text, try to extract images
-                    if not page_text.strip():
-                        logger.info(f"Page {page_num + 1} has no text. Extracting images if present.")
-                        self._extract_images_from_page(page, page_num)
+                    image_futures = []
+                    for page_num, page_text in enumerate(page_texts):
+                        if not page_text.strip():
+                            logger.info(f"Page {page_num + 1} has no text. Extracting images if present.")
+                            for img_index, img in enumerate(pdf_document[page_num].get_images(full=True)):
+                                future = executor.submit(_extract_image, self.pdf_path, img[0])
+                                image_futures.append((page_num, img_index, future))
+                        
+                        yield page_text
                     
-                    pdf_text += page_text
-            
-            # Ensure proper encoding
-            pdf_text = pdf_text.encode('utf-8', errors='replace').decode('utf-8')
-            return pdf_text
+                    # Images are compressed in the pool too, then added to self.book here
+                    for page_num, img_index, future in image_futures:
+                        image = future.result()
+                        if image is not None:
+                            self._add_image_to_epub(*image, page_num, img_index)
             
         except Exception as e:
             logger.error(f"Error reading PDF: {e}", exc_info=True)
@@ -128,192 +481,174 @@ class PDFToEPUBConverter:
         except Exception as e:
             logger.warning(f"Could not extract cover image: {e}")
     
-    def _extract_images_from_page(self, page: fitz.Page, page_num: int) -> None:
-        """Extract images from a PDF page and add them to the EPUB.
+    def _add_image_to_epub(self, image_bytes: bytes, image_ext: str, page_num: int, img_index: int) -> None:
+        """Add an extracted page image to the EPUB.
         
         Args:
-            page: The PDF page to extract images from
+            image_bytes: The compressed image bytes
+            image_ext: The image extension
             page_num: The page number
+            img_index: Index of the image on the page
         """
-        try:
-            images = page.get_images(full=True)
-            
-            for img_index, img in enumerate(images):
-                xref = img[0]
-                base_image = page.parent.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                
-                # Compress the image
-                compressed_image_bytes = self._compress_image(image_bytes)
-                
-                # Create image name and add to EPUB
-                image_name = f"page_{page_num + 1}_{img_index + 1}.{image_ext}"
-                
-                # Add the image as a standalone HTML page
-                img_html = epub.EpubHtml(
-                    title=f"Image Page {page_num + 1}",
-                    file_name=f"image_page_{page_num + 1}_{img_index + 1}.xhtml",
-                    lang="en",
-                )
-                img_html.content = f'<img src="{image_name}" alt="Page {page_num + 1} Image"/>'
-                
-                epub_image = epub.EpubItem(
-                    uid=f"image_{page_num + 1}_{img_index + 1}",
-                    file_name=image_name,
-                    media_type=f"image/{image_ext}",
-                    content=compressed_image_bytes,
-                )
-                
-                self.book.add_item(epub_image)
-                self.book.add_item(img_html)
-                
-                logger.info(f"Added image from page {page_num + 1}")
-        except Exception as e:
-            logger.warning(f"Error extracting images from page {page_num + 1}: {e}")
-    
-    def _preserve_formatting(self, page: fitz.Page) -> str:
-        """Preserve formatting (bold, italic) in extracted text.
+        # Create image name and add to EPUB
+        image_name = f"page_{page_num + 1}_{img_index + 1}.{image_ext}"
+        
+        # Add the image as a standalone HTML page
+        img_html = epub.EpubHtml(
+            title=f"Image Page {page_num + 1}",
+            file_name=f"image_page_{page_num + 1}_{img_index + 1}.xhtml",
+            lang="en",
+        )
+        img_html.content = f'<img src="{image_name}" alt="Page {page_num + 1} Image"/>'
         
-        Args:
-            page: The PDF page
-            
-        Returns:
-            str: Text with HTML formatting tags
-        """
-        text_with_formatting = ""
-        try:
-            for block in page.get_text("dict")["blocks"]:
-                if "lines" not in block:
-                    continue
-                    
-                for line in block["lines"]:
-                    line_text = ""
-                    
-                    for span in line["spans"]:
-                        span_text = span["text"]
-                        is_italic = span["flags"] & 2  # Check italic flag
-                        is_bold = "bold" in span["font"].lower() or span["flags"] & 16  # Check bold flag
-                        
-                        # Apply formatting
-                        if is_bold and is_italic:
-                            span_text = f"<b><i>{span_text}</i></b>"
-                        elif is_bold:
-                            span_text = f"<b>{span_text}</b>"
-                        elif is_italic:
-                            span_text = f"<i>{span_text}</i>"
-                            
-                        line_text += span_text
-                        
-                    text_with_formatting += line_text + "\n"
-                    
-            return text_with_formatting
-        except Exception as e:
-            logger.warning(f"Error preserving formatting: {e}")
-            return page.get_text("text")  # Fallback to plain text
-    
-    def _compress_image(self, image_bytes: bytes, quality: int = 75) -> bytes:
-        """Compress an image to reduce file size.
+        epub_image = epub.EpubItem(
+            uid=f"image_{page_num + 1}_{img_index + 1}",
+            file_name=image_name,
+            media_type=f"image/{image_ext}",
+            content=image_bytes,
+        )
         
-        Args:
-            image_bytes: The original image bytes
-            quality: Compression quality (1-100)
-            
-        Returns:
-            bytes: Compressed image bytes
-        """
-        try:
-            image = Image.open(io.BytesIO(image_bytes))
-            compressed = io.BytesIO()
-            
-            # Use JPEG for RGB or CMYK images for better compression
-            if image.mode in ('RGB', 'CMYK'):
-                image.save(compressed, format='JPEG', quality=quality, optimize=True)
-            else:
-                # For PNG or GIF with transparency
-                image.save(compressed, format=image.format, optimize=True)
-                
-            return compressed.getvalue()
-        except Exception as e:
-            logger.warning(f"Image compression failed: {e}")
-            return image_bytes  # Return original if compression fails
+        self.book.add_item(epub_image)
+        self.book.add_item(img_html)
+        
+        logger.info(f"Added image from page {page_num + 1}")
     
-    def _merge_split_lines(self, lines: List[str]) -> str:
+    def _merge_split_lines(self, lines: Iterable[str]) -> Iterator[str]:
         """Merge lines intelligently to address split words across lines, preserving chapter headings.
         
         Args:
-            lines: List of text lines
+            lines: Text lines
             
-        Returns:
-            str: Merged text
+        Yields:
+            str: Merged lines, with blank lines before chapter headings
         """
-        merged_text = ""
+        current: List[str] = []  # Parts of the line being built
+        has_text = False
+        last_char = ""
         prev_is_chapter = False
         
+        # Bound once, outside the per-line loop
+        match_heading = self._match_heading
+        
         for i, line in enumerate(lines):
             stripped_line = line.strip()
             
             if not stripped_line:
                 continue
-                
-            stripped_line_wo_tags = self._strip_tags(stripped_line)
             
             # Check if line is a chapter heading
-            is_chapter = (self.chapter_pattern.match(stripped_line_wo_tags) or 
-                          self.prologue_epilogue_pattern.match(stripped_line_wo_tags))
+            is_chapter = match_heading(stripped_line)
             
             if is_chapter:
                 # Add as standalone line with spacing
                 prev_is_chapter = True
-                if merged_text:
-                    merged_text += "\n"  # End the previous paragraph
-                merged_text += "\n" + stripped_line + "\n"  # Add chapter line
-            elif merged_text and not merged_text.endswith((".", ":", "!", "?", "\n", '"', "'", ")", "]", "}")):
+                if has_text:
+                    yield "".join(current)  # End the previous paragraph
+                yield ""
+                yield stripped_line  # Add chapter line
+                current = []
+                last_char = "\n"
+            elif current and last_char not in _BREAK_CHARS:
                 # Merge with previous line (likely continuing a sentence)
                 prev_is_chapter = False
-                merged_text += f" {stripped_line}"
+                current.append(f" {stripped_line}")
+                last_char = stripped_line[-1]
             else:
                 # Start a new paragraph
-                if merged_text:
-                    merged_text += "\n"
-                merged_text += stripped_line
+                if has_text:
+                    yield "".join(current)
+                current = [stripped_line]
+                last_char = stripped_line[-1]
                 
                 # Special case for single word after chapter heading (possible subtitle)
-                if len(stripped_line_wo_tags.split()) == 1 and prev_is_chapter:
-                    merged_text += "\n"
+                if prev_is_chapter and len(self._strip_tags(stripped_line).split()) == 1:
+                    yield stripped_line
+                    current = []
+                    last_char = "\n"
                 
                 prev_is_chapter = False
+            
+            has_text = True
         
-        return merged_text
+        if current:
+            yield "".join(current)
     
-    def _detect_chapters(self, pdf_text: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    def _detect_chapters(self, lines: Iterable[str]) -> Iterator[Tuple[List[str], Optional[str]]]:
         """Detect chapter headings and split text into chapters.
         
+        Chapters are yielded as soon as their end is certain, so only the lines
+        of the chapter being read are kept in memory.
+        
         Args:
-            pdf_text: The merged PDF text
+            lines: The merged PDF text lines
             
-        Returns:
-            tuple: List of chapter texts and names, and introductory text lines
+        Yields:
+            tuple: Chapter lines and name. The first item is always the
+            introductory text lines, with no name.
         """
-        chapters = []
-        lines = pdf_text.splitlines()
+        buffer: List[str] = []  # Lines from index `offset` on
+        offset = 0
         start_indices = []
         original_chapter_names = []
+        intro_done = False
         
         prev_is_chapter = False
         chapter_number = 1
         consecutive_chapter_index = 0
         
+        def flush(final_count: int) -> Iterator[Tuple[List[str], Optional[str]]]:
+            """Yield the intro and chapters whose start and end are both final."""
+            nonlocal offset, intro_done
+            
+            if final_count >= 1 and not intro_done:
+                intro_done = True
+                end = start_indices[0] - offset
+                yield buffer[:end], None
+                del buffer[:end]
+                offset = start_indices[0]
+            
+            while final_count >= 2:
+                end = start_indices[1] - offset
+                yield buffer[:end], original_chapter_names[0]
+                del buffer[:end]
+                offset = start_indices[1]
+                del start_indices[0]
+                del original_chapter_names[0]
+                final_count -= 1
+        
+        # Bound once, outside the per-line loop
+        match_heading = self._match_heading
+        strip_tags = self._strip_tags
+        convert_roman = self._convert_line_if_roman
+        
         # Detect lines that match chapter patterns
-        for i, line in enumerate(lines):
-            clean_line = self._strip_tags(line.strip())
+        for i, (line, next_lines) in enumerate(_lookahead(lines, 2)):
+            # Only the newest start can be discarded, and only by the heading
+            # right after it, so every other start is final
+            yield from flush(len(start_indices) - 1 if prev_is_chapter else len(start_indices))
+            buffer.append(line)
+            
+            stripped_line = line.strip()
+            
+            if not stripped_line:  # Skip empty lines
+                continue
             
-            if not clean_line:  # Skip empty lines
+            heading_match = match_heading(stripped_line)
+            if not heading_match:
+                prev_is_chapter = False
                 continue
             
+            clean_line = strip_tags(stripped_line).strip()
+            
             # Check if line matches chapter pattern
-            if self.chapter_pattern.match(clean_line):
-                clean_line_numeric = str(self._convert_line_if_roman(clean_line))
+            if heading_match.group("chapter") is not None:
+                roman_numeral, number = heading_match.group("roman", "number")
+                if number is not None:
+                    chapter_value = int(number)
+                elif roman_numeral is not None:
+                    chapter_value = convert_roman(roman_numeral)
+                else:
+                    chapter_value = None  # Not a bare number, e.g. "Chapter Two"
                 
                 if prev_is_chapter:
                     consecutive_chapter_index += 1
@@ -321,7 +656,7 @@ class PDFToEPUBConverter:
                     consecutive_chapter_index = 0
                 
                 # Skip if not a valid chapter sequence or is a consecutive chapter-like line
-                if (clean_line_numeric.isnumeric() and int(clean_line_numeric) != chapter_number) or prev_is_chapter:
+                if (chapter_value is not None and chapter_value != chapter_number) or prev_is_chapter:
                     logger.debug(f"Skipped potential chapter indicator at line {i + 1}: {clean_line}")
                     
                     # Discard false positive chapter detection
@@ -341,17 +676,17 @@ class PDFToEPUBConverter:
                 
                 # Check for subtitle (one word on next line)
                 chapter_name = clean_line
-                for j in range(i+1, min(i+3, len(lines))):
-                    if lines[j].strip():
-                        next_line = lines[j].strip()
-                        words = self._strip_tags(next_line).split()
+                for next_line in next_lines:
+                    if next_line.strip():
+                        next_line = next_line.strip()
+                        words = strip_tags(next_line).split()
                         if len(words) <= 2:  # Consider 1-2 words as potential subtitle
                             chapter_name += " " + next_line
                         break
                         
                 original_chapter_names.append(chapter_name)
                 
-            elif self.prologue_epilogue_pattern.match(clean_line):
+            else:
                 logger.info(f"Prologue or Epilogue found at line {i + 1}: {clean_line}")
                 
                 # Skip epilogue if it's the first chapter-like element
@@ -359,26 +694,13 @@ class PDFToEPUBConverter:
                     prev_is_chapter = True
                     start_indices.append(i)
                     original_chapter_names.append(line)
-            else:
-                prev_is_chapter = False
         
-        # Add the last line index to complete the last chapter
-        start_indices.append(len(lines))
-        
-        # Extract chapters based on start indices
-        if start_indices:
-            for i in range(len(start_indices) - 1):
-                chapter_lines = lines[start_indices[i]:start_indices[i + 1]]
-                chapters.append((
-                    "\n".join(chapter_lines).strip(),
-                    original_chapter_names[i]
-                ))
-            
-            return chapters, lines[:start_indices[0]]
-        else:
-            # No chapters found, treat entire document as single chapter
+        if not start_indices:
             logger.warning("No chapters found in document")
-            return [(pdf_text, "Chapter 1")], []
+        
+        # Add the last line index to complete the last chapter
+        start_indices.append(offset + len(buffer))
+        yield from flush(len(start_indices))
     
     def _add_intro_to_epub(self, intro_text_lines: List[str]) -> None:
         """Add introductory text to the EPUB if it exists.
@@ -389,19 +711,16 @@ class PDFToEPUBConverter:
         if not intro_text_lines:
             return
             
-        intro_text = "\n".join(intro_text_lines)
-        intro_paragraphs = intro_text.splitlines()
-        
         # Clean and process paragraphs
         clean_paragraphs = []
-        for para in intro_paragraphs:
+        for para in intro_text_lines:
             if para.strip():
                 clean_paragraphs.append(para.strip())
         
         # Create proper HTML content
-        intro_html_content = "<h1>Introduction</h1>"
+        intro_html_parts = ["<h1>Introduction</h1>"]
         for para in clean_paragraphs:
-            intro_html_content += f"<p>{para}</p>"
+            intro_html_parts.append(f"<p>{para}</p>")
         
         # Create EPUB chapter
         intro_chapter = epub.EpubHtml(
@@ -409,44 +728,41 @@ class PDFToEPUBConverter:
             file_name="intro.xhtml",
             lang="en"
         )
-        intro_chapter.content = intro_html_content
+        intro_chapter.content = "".join(intro_html_parts)
         self.book.add_item(intro_chapter)
         
         # Store for navigation
         self.intro_chapter = intro_chapter
     
-    def _add_chapters_to_epub(self, chapters: List[Tuple[str, str]]) -> None:
+    def _add_chapters_to_epub(self, chapters: Iterable[Tuple[List[str], str]]) -> None:
         """Add chapters to the EPUB.
         
         Args:
-            chapters: List of tuples containing chapter text and name
+            chapters: List of tuples containing chapter lines and name
         """
         self.chapter_items = []
         
-        for i, (chapter_text, chapter_name) in enumerate(chapters, start=1):
+        for i, (chapter_lines, chapter_name) in enumerate(chapters, start=1):
             # Create chapter item
             chapter = epub.EpubHtml(
-                title=chapter_name,
+                title=html.unescape(chapter_name),
                 file_name=f"chapter_{i}.xhtml",
                 lang="en"
             )
             
             # Process paragraphs
-            paragraphs = self._detect_paragraphs(chapter_text.splitlines())
+            paragraphs = self._detect_paragraphs(chapter_lines)
             
             # Create HTML content
-            html_content = f"<h1>{chapter_name}</h1>"
-            
-            # Remove chapter title from content to avoid duplication
-            start_idx = chapter_text.find(chapter_name) + len(chapter_name)
-            content_text = chapter_text[start_idx:].strip()
+            html_parts = [f"<h1>{chapter_name}</h1>"]
             
-            # Add paragraphs
+            # Add paragraphs, skipping the chapter title to avoid duplication
             for para in paragraphs:
-                if para not in chapter_name and para.strip():
-                    html_content += f"<p>{para}</p>"
+                para = para.strip()
+                if para and para != chapter_name:
+                    html_parts.append(f"<p>{para}</p>")
             
-            chapter.content = html_content
+            chapter.content = "".join(html_parts)
             self.book.add_item(chapter)
             self.chapter_items.append(chapter)
             
@@ -490,32 +806,42 @@ class PDFToEPUBConverter:
         Returns:
             list: List of paragraphs
         """
-        paragraphs = []
-        current_paragraph = []
-
-        for i, line in enumerate(lines):
-            stripped_line = line.strip()
-
-            # Heuristic to detect a new paragraph:
-            if (
-                stripped_line and
-                (i == 0 or stripped_line[0].isupper() and current_paragraph and current_paragraph[-1].endswith('.'))
-            ):
-                # Start a new paragraph if line starts with a capital letter after a period
-                if current_paragraph:
-                    paragraphs.append(" ".join(current_paragraph))
-                    current_paragraph = []
-
-            # Add the line to the current paragraph
-            if stripped_line:
-                current_paragraph.append(stripped_line)
-
-        # Add any remaining text as the last paragraph
-        if current_paragraph:
-            paragraphs.append(" ".join(current_paragraph))
+        stripped_lines = [line for line in (line.strip() for line in lines) if line]
+        
+        # Start a new paragraph if line starts with a capital letter after a period
+        breaks = [
+            i for i, (prev_line, line) in enumerate(zip(stripped_lines, stripped_lines[1:]), start=1)
+            if line[0].isupper() and prev_line.endswith('.')
+        ]
+        
+        # Join the lines between consecutive breaks
+        bounds = [0] + breaks + [len(stripped_lines)]
+        paragraphs = [
+            " ".join(stripped_lines[start:end])
+            for start, end in zip(bounds, bounds[1:])
+            if start < end
+        ]
         
         return paragraphs
     
+    def _match_heading(self, line: str) -> Optional[re.Match]:
+        """Match a stripped line against the heading pattern.
+        
+        Tags around the heading are handled by the pattern itself. Lines with
+        tags inside the heading, e.g. "<b>Chapter</b> 1", are matched again
+        with their tags removed.
+        
+        Args:
+            line: The stripped line to check
+            
+        Returns:
+            The match, or None if the line is not a heading
+        """
+        heading_match = self._heading_re.match(line)
+        if heading_match is None and "<" in line:
+            heading_match = self._heading_re.match(self._strip_tags(line))
+        return heading_match
+    
     def _strip_tags(self, text: str) -> str:
         """Remove HTML-like tags from a line.
         
@@ -525,7 +851,10 @@ class PDFToEPUBConverter:
         Returns:
             str: Text without HTML tags
         """
-        return re.sub(r"<[^>]*>", "", text)
+        # Most lines carry no tags, so skip the regex engine for them
+        if "<" not in text:
+            return text
+        return _TAG_RE.sub("", text)
     
     def _convert_line_if_roman(self, line: str) -> Any:
         """Convert a line to a number if it is a valid Roman numeral.
@@ -536,10 +865,15 @@ class PDFToEPUBConverter:
         Returns:
             Either a number or the original line
         """
-        roman_pattern = re.compile(r"^[IVXLCDM]+$", re.IGNORECASE)
         stripped_line = line.strip().upper()
         
-        if roman_pattern.match(stripped_line):
+        # Chapter numerals are small, so most are a single lookup
+        value = _ROMAN_CACHE.get(stripped_line)
+        if value is not None:
+            return value
+        
+        # Cheap gate so most lines never reach the regex
+        if stripped_line.isascii() and stripped_line.isalpha() and _ROMAN_RE.match(stripped_line):
             return self._roman_to_int(stripped_line)
         return line
     
@@ -552,88 +886,13 @@ class PDFToEPUBConverter:
         Returns:
             int: Converted integer
         """
-        roman_map = {
-            'I': 1, 'V': 5, 'X': 10, 'L': 50,
-            'C': 100, 'D': 500, 'M': 1000
-        }
-        value = 0
-        prev_value = 0
-        
-        for char in reversed(roman):
-            current_value = roman_map.get(char, 0)
-            if current_value < prev_value:
-                value -= current_value
-            else:
-                value += current_value
-            prev_value = current_value
-            
-        return value
-    
-    def _build_chapter_pattern(self) -> re.Pattern:
-        """Build regex pattern for detecting chapter headings.
+        values = [_ROMAN_MAP.get(char, 0) for char in roman]
         
-        Returns:
-            re.Pattern: Compiled regex pattern
-        """
-        textual_numbers = self._generate_textual_numbers()
-        textual_numbers_regex = "|".join(re.escape(num) for num in textual_numbers)
-        
-        pattern = re.compile(
-            rf"^(?:"
-            rf"Chapter\s+(?:\d{{1,3}}(?=\b)|[IVXLCDM]+|{textual_numbers_regex})|"
-            rf"CHAPTER\s+(?:\d{{1,3}}(?=\b)|[IVXLCDM]+|{textual_numbers_regex})|"
-            rf"CHAPTER\s+(?:\d{{1,3}}(?=\b)|[IVXLCDM]+|{textual_numbers_regex})(?:[:\-\s]+.+)?|"
-            rf"[IVXLCDM]+|\d{{1,3}}(?=\b)"
-            rf")$",
-            re.IGNORECASE
+        # A numeral is subtracted when a larger one follows it (IV, XC, ...)
+        return sum(
+            value if value >= next_value else -value
+            for value, next_value in zip(values, values[1:] + [0])
         )
-        
-        return pattern
-    
-    def _build_prologue_epilogue_pattern(self) -> re.Pattern:
-        """Build regex pattern for detecting prologue and epilogue headings.
-        
-        Returns:
-            re.Pattern: Compiled regex pattern
-        """
-        return re.compile(
-            r"^(?:PROLOGUE|EPILOGUE|PREFACE|FOREWORD|INTRODUCTION|AFTERWORD|POSTSCRIPT)$",
-            re.IGNORECASE
-        )
-    
-    def _generate_textual_numbers(self) -> List[str]:
-        """Generate a list of textual numbers up to ONE THOUSAND.
-        
-        Returns:
-            list: List of textual number representations
-        """
-        units = ["ONE", "TWO", "THREE", "FOUR", "FIVE", "SIX", "SEVEN", "EIGHT", "NINE"]
-        teens = [
-            "TEN", "ELEVEN", "TWELVE", "THIRTEEN", "FOURTEEN",
-            "FIFTEEN", "SIXTEEN", "SEVENTEEN", "EIGHTEEN", "NINETEEN"
-        ]
-        tens = ["TWENTY", "THIRTY", "FORTY", "FIFTY", "SIXTY", "SEVENTY", "EIGHTY", "NINETY"]
-        
-        # Generate numbers below 100
-        textual_numbers = units + teens
-        for ten in tens:
-            textual_numbers.append(ten)
-            for unit in units:
-                textual_numbers.append(f"{ten}-{unit}")
-                textual_numbers.append(f"{ten} {unit}")
-        
-        # Add hundreds
-        hundreds = []
-        for unit in units:
-            hundreds.append(f"{unit} HUNDRED")
-            for number in textual_numbers:
-                hundreds.append(f"{unit} HUNDRED AND {number}")
-        textual_numbers += hundreds
-        
-        # Add one thousand
-        textual_numbers.append("ONE THOUSAND")
-        
-        return textual_numbers
 
 
 def convert_pdf_to_epub(pdf_path: str, epub_path: str, title: str = None, author: str = "Unknown") -> bool: